@@ -4,7 +4,11 @@ Functions storage
 
 from math import gcd
 from itertools import chain, count
-from functools import reduce
+from functools import lru_cache, reduce
+from types import FunctionType
+
+# numba compiled versions of the kernels of this module, filled on first use (see _jitted)
+_JIT = {}
 
 
 def reduce_fraction(num: int, den: int):
@@ -54,6 +58,57 @@ def factorization_generator(n: int):
             yield i
 
 
+def _prime_factors(n: int) -> list:
+    """
+    List of the prime factors of n (n > 1, repeated as many times as they divide n),
+    found by trial division like factorization_generator, but written with plain
+    integer operations only, so that it can be compiled by numba
+
+    :param n: integer
+    :return: list of integers factors
+    """
+    factors = []
+    while n % 2 == 0:
+        n //= 2
+        factors.append(2)
+    i = 3
+    while i * i <= n:
+        while n % i == 0:
+            n //= i
+            factors.append(i)
+        i += 2
+    if n > 1:
+        factors.append(n)
+    return factors
+
+
+def _jitted(func):
+    """
+    numba compiled version of func, numba is imported and func compiled on the first call only,
+    so that importing this module (or never using the kernels) does not load numba
+
+    :param func: kernel function
+    :return: compiled function, None if numba is not installed (callers then use their python path)
+    """
+    try:
+        return _JIT[func]
+    except KeyError:
+        try:
+            from numba import njit
+        except ImportError:
+            compiled = None
+        else:
+            kernel = func
+            if func is not _prime_factors and '_prime_factors' in func.__code__.co_names:
+                # the kernel calls the factorizer: compile it against the compiled one, so there is
+                # a single compiled trial division
+                namespace = dict(func.__globals__, _prime_factors=_jitted(_prime_factors))
+                kernel = FunctionType(func.__code__, namespace, func.__name__, func.__defaults__, func.__closure__)
+            compiled = njit(cache=True)(kernel)
+        _JIT[func] = compiled
+        return compiled
+
+
 def factorization(n: int) -> dict:
     """
     Function that returns a dictionary representing the factorized form of abs(n),
@@ -64,7 +119,11 @@ def factorization(n: int) -> dict:
     :return: dict of factors: exponent
     """
     f = {}
-    for factor in factorization_generator(n):
+    n = abs(n)
+    # compiled trial division for the integers that fit in a machine word
+    jit = _jitted(_prime_factors) if 1 < n < 1 << 62 else None
+    factors = jit(n) if jit else factorization_generator(n)
+    for factor in factors:
         try:
             f[factor] += 1
         except KeyError:
@@ -84,6 +143,47 @@ def build_factorized(factorized: dict) -> int:
     return int(num)
 
 
+def _reduce_root_kernel(index: int, radicand: int):
+    """
+    reduce_root for positive index and radicand > 1, written with plain integer operations only
+    (prime factors from _prime_factors, grouped in a list of primes and a parallel one of exponents),
+    so that it can be compiled by numba
+
+    :param index: index int
+    :param radicand: radicand int
+    :return: mul factor, reduced index and radicand
+    """
+
+    # factorize radicand (_prime_factors yields equal factors next to each other)
+    primes = []
+    exponents = []
+    for p in _prime_factors(radicand):
+        if primes and primes[-1] == p:
+            exponents[-1] += 1
+        else:
+            primes.append(p)
+            exponents.append(1)
+
+    # reduce index
+    _gcd = index
+    for e in exponents:
+        _gcd = gcd(_gcd, e)
+    index //= _gcd
+
+    # bring terms out of root and rebuild radical
+    mul_factor = 1
+    radicand = 1
+    for i in range(len(primes)):
+        e = exponents[i] // _gcd
+        if index < e:
+            mul_factor *= primes[i] ** (e // index)
+            e %= index
+        radicand *= primes[i] ** e
+
+    return mul_factor, index, radicand
+
+
+@lru_cache(maxsize=4096)
 def reduce_root(index: int, radicand: int):
     """
     reduce root:
@@ -98,9 +198,14 @@ def reduce_root(index: int, radicand: int):
 
     :param index: index int
     :param radicand: radicand int
-    :return: reduced index and radicand
+    :return: reduced index and radicand (cached, as roots of the same radicands are usually reduced many times)
     """
 
+    # compiled root reduction for the radicands that fit in a machine word
+    jit = _jitted(_reduce_root_kernel) if index > 0 and 1 < radicand < 1 << 62 else None
+    if jit:
+        return jit(index, radicand)
+
     # reduce index
     factorized = factorization(radicand)
     _gcd = multi_gcd([factorized[f] for f in factorized] + [index])
@@ -41,27 +41,239 @@ the square root operation.
 # TODO update string build for RN class (maybe with operation priority implementation)
 
 
-from abc import ABCMeta, abstractmethod, ABC
-from numpy import lcm
 import math
-from rnenv111.rn.mathfuncs.funcs import reduce_fraction, reduce_root
+import operator
+from functools import lru_cache, partial, reduce
+from itertools import chain
+from weakref import WeakValueDictionary
+from rnenv111.rn.mathfuncs.funcs import reduce_root
 
 
-math = math
+_gcd = math.gcd
+
+
+def _run_code(code):
+    """
+    Run the instructions compiled by RN._compile, using a list as values stack;
+    the value calculated for each RN of the code is cached on it too
+
+    :param code: tuple of instructions
+    :return: Float
+    """
+
+    values = []
+    for op, arg in code:
+        if op is None:
+            values.append(arg)
+        else:
+            n = len(arg.terms)
+            flt_terms = values[-n:]
+            del values[-n:]
+            value = arg._fcache = float(_FLOAT_OPERATIONS[op](*flt_terms))
+            values.append(value)
+    return values[0]
+
+
+def _njit_source(rn):
+    """
+    Generate the source of a function f(v) calculating the float value of rn, where v holds the values
+    of the leaves of rn (its integers, in the order they are written); each operation of the terms
+    tree is a line of the function, assigning its result to a new local variable.
+
+    :param rn: RN object
+    :return: source string, tuple of the leaves of rn (ints)
+    """
+
+    lines = ['def f(v):']
+    leaves = []
+    names = []
+    stack = [(rn, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if not isinstance(node, RN) or not node.op:
+            names.append('v[{}]'.format(len(leaves)))
+            leaves.append(node if not isinstance(node, RN) else node.terms[0])
+        elif expanded:
+            n = len(node.terms)
+            terms = names[-n:]
+            del names[-n:]
+            names.append('t{}'.format(len(lines)))
+            lines.append('    {} = {}'.format(names[-1], _SOURCE_OPERATIONS[node.op](*terms)))
+        else:
+            stack.append((node, True))
+            stack.extend((term, False) for term in reversed(node.terms))
+    lines.append('    return float({})'.format(names[0]))
+    return '\n'.join(lines), tuple(leaves)
+
+
+# compiled functions of RN.as_njit_callable, keyed by their source (same for RNs of the same structure)
+_NJIT_CACHE = {}
+
+
+# denominators magnitude over which fractions products are cross cancelled (see _fraction_product)
+_LARGE = 1 << 30
+
+
+def _fraction_product(num_1, den_1, num_2, den_2):
+    """
+    Numerator and denominator of the product of two fractions of integers, to be reduced by _fraction:
+    the products are usually left to the single gcd of _fraction, but if a denominator is large
+    the terms are cross cancelled before multiplying, so that the gcd is computed on smaller numbers.
+
+    :return: (num, den) tuple of ints
+    """
+
+    if abs(den_1) > _LARGE or abs(den_2) > _LARGE:
+        g_1 = _gcd(num_1, den_2)
+        g_2 = _gcd(num_2, den_1)
+        return (num_1 // g_1) * (num_2 // g_2), (den_1 // g_2) * (den_2 // g_1)
+    return num_1 * num_2, den_1 * den_2
+
+
+def _fraction(num, den):
+    """
+    Build the RN of the fraction num / den of two integers (den != 0),
+    reduced with a single gcd: simple RN if den is reduced to 1, else TrueDiv RN
+
+    :param num: numerator int
+    :param den: denominator int
+    :return: RN object
+    """
+
+    g = _gcd(num, den)
+    if g != 1:
+        num //= g
+        den //= g
+    if den == 1 or not num:
+        return RN._make(None, (num, ))
+    data = (RN._make(None, (num, )), RN._make(None, (den, )))
+    return RN._make(TrueDiv, data)
+
+
+@lru_cache(maxsize=4096)
+def _iroot(n, k):
+    """
+    Integer k-th root of n (n >= 0, k > 0), computed exactly with integers only
+    (math.isqrt for square roots, Newton's method otherwise)
+
+    :param n: radicand int
+    :param k: index int
+    :return: (root, exact) tuple, root is the floor of the k-th root of n, exact is True if root ** k == n
+    """
+
+    if k == 1 or n < 2:
+        return n, True
+    if k == 2:
+        root = math.isqrt(n)
+        return root, root * root == n
+    # start from a power of 2 above the root, Newton's steps then decrease to the floor of the root
+    x = 1 << ((n.bit_length() + k - 1) // k)
+    while True:
+        y = ((k - 1) * x + n // x ** (k - 1)) // k
+        if y >= x:
+            break
+        x = y
+    return x, x ** k == n
+
+
+def _rational(rn):
+    """
+    Get numerator and denominator of rn if it is an integer or a fraction of integers
+
+    :param rn: RN object
+    :return: (num, den) ints, or None if rn is not rational
+    """
+
+    if not rn.op:
+        return rn[0], 1
+    if rn.op is TrueDiv:
+        num, den = rn.terms
+        if isinstance(num, RN) and isinstance(den, RN) and not (num.op or den.op):
+            return num[0], den[0]
+    return None
+
+
+def _is_zero(term):
+    """
+    Check if an operation term is zero, reading the integer of simple RNs (and int terms) directly,
+    the float value is only calculated for the other RNs
+
+    :param term: RN or int
+    :return: Boolean
+    """
+
+    if isinstance(term, int):
+        return term == 0
+    if not term.op:
+        return term.terms[0] == 0
+    return float(term) == 0.0
+
+
+def _merge_key(term):
+    """
+    Key of the terms of a sum that may be merged by adding them (see Add._merge_sum):
+    - rational terms (integers and fractions of integers) can always be merged
+    - a root (or any other RN) can be merged with itself or its products by an integer,
+      as equal RNs are unique (see RN.__new__), the RN identity is used
+
+    :param term: RN sum term
+    :return: hashable key
+    """
+
+    if not term.op or _rational(term):
+        return None
+    if term.op is Mul and len(term.terms) == 2:
+        # the integer coefficient may be either term (-root is stored as root * -1)
+        for coefficient, rest in (term.terms, term.terms[::-1]):
+            if not isinstance(coefficient, RN) or not coefficient.op:
+                return id(rest)
+    return id(term)
+
+
+@lru_cache(maxsize=4096)
+def _merged_terms(terms):
+    """
+    Cached implementation of Add._merge_sum (see its DOC)
+
+    :param terms: tuple of sum terms
+    :return: tuple of merged terms
+    """
+
+    groups = {}
+    for term in terms:
+        group = groups.setdefault(_merge_key(term), [])
+        if group:
+            _sum = group[-1] + term
+            if _sum.op is not Add:
+                group[-1] = _sum
+                continue
+        group.append(term)
+    # the rationals are merged in a single term: drop it if it is zero (unless it is the only term)
+    rationals = groups.get(None)
+    if rationals and len(groups) > 1 and _is_zero(rationals[0]):
+        del groups[None]
+    # sort by op class name
+    return tuple(sorted(chain.from_iterable(groups.values()), key=lambda x: x.op._lname if x.op else 'none'))
 
 
 # op validator (used to assert that other is always an RN, even if integers are also accepted)
-def _validate(func):
-    def inner(self, other):
-        # self is already RN
-        if not (isinstance(other, RN) or isinstance(other, int)):
-            raise ValueError('Unable to perform {} between {} (RN) and {} ({})'
-                             .format(func, self, other, type(other)))
-        if isinstance(other, int):
-            other = RN(other)
-        return func(self, other)
+def _operand(rn, other, func):
+    """
+    Slow path of the operand check performed by the RN operation methods,
+    only called when other is not an RN: turn integers into RN, raise error for any other type
 
-    return inner
+    :param rn: RN performing the operation
+    :param other: other operand
+    :param func: name of the operation method
+    :return: RN operand
+    """
+
+    if isinstance(other, int):
+        return RN(other)
+    if not isinstance(other, RN):
+        raise ValueError('Unable to perform {} between {} (RN) and {} ({})'
+                         .format(func, rn, other, type(other)))
+    return other
 
 
 class RN:
@@ -74,7 +286,10 @@ class RN:
     # ACCEPTED / IMPLEMENTED OPERATIONS CLASSES
     PERMITTED_OPERATIONS = ()
 
-    def __init__(self, *terms, op=None):
+    # no instance __dict__, RN only stores its op, terms and the cached values
+    __slots__ = ('op', 'terms', '_str', '_fcache', '_code', '_hash', '__weakref__')
+
+    def __new__(cls, *terms, op=None):
         """
         The type of RN instantiated depends from the parameters passed by the user:
         if the kw op is not specified (left as None), it will assume that self is a 'simple' RN (integer),
@@ -93,6 +308,12 @@ class RN:
                    trying to represent an integer real number
         :param terms: terms of the instance, if no operator is specified, only one term needs to be passed, else
                       the number depends on the operator type.
+
+        As RN objects are never modified, the simple RNs of the small integers (see _INT_CACHE) are
+        created once and shared, instead of allocating a new RN every time.
+        The same goes for any other RN still alive (see _RN_TABLE): an RN with the same op and
+        the same term objects of an existing one is that one, so equal subtrees are stored
+        (and evaluated) once.
         """
 
         if not op:
@@ -104,8 +325,51 @@ class RN:
                 raise ValueError('Bad user argument, RN where op is not specified should get only int objects,'
                                  ' got {}'.format(type(terms[0])))
 
+        return cls._make(op, terms)
+
+    @classmethod
+    def _make(cls, op, terms):
+        """
+        Trusted constructor, used by the RN and Operation methods whose terms are valid by construction:
+        build the RN of op and terms (tuple) without validating them.
+
+        Returns the shared small integer (see _INT_CACHE) or unique (see _RN_TABLE) RN if there is one.
+
+        :param op: reference to the operator, None for simple RNs
+        :param terms: tuple of terms
+        :return: RN object
+        """
+
+        if cls is not RN:
+            key = None
+        elif not op:
+            key = terms[0]
+            if key.__class__ is not int:
+                key = None
+            else:
+                cached = _INT_CACHE.get(key)
+                if cached is not None:
+                    return cached
+        else:
+            # terms are already unique, so their identities are enough to identify the RN
+            key = (op, *map(id, terms))
+
+        if key is not None:
+            cached = _RN_TABLE.get(key)
+            if cached is not None:
+                return cached
+
+        self = object.__new__(cls)
         self.op = op
         self.terms = terms
+        # string representation, float value, compiled code and hash caches (RN is never modified after initialization)
+        self._str = None
+        self._fcache = None
+        self._code = None
+        self._hash = None
+        if key is not None:
+            _RN_TABLE[key] = self
+        return self
 
     # string representation
     def __str__(self):
@@ -113,12 +377,16 @@ class RN:
         If op is None, will return the string of the only term.
         Else, will use the string method defined in the op class
 
+        The string is built once and then cached on the instance.
+
         :return: string representation of instance
         """
 
-        if not self.op:
-            return str(self[0])
-        return self.op.string(self.terms)
+        string = self._str
+        if string is None:
+            string = str(self[0]) if not self.op else self.op.string(self.terms)
+            self._str = string
+        return string
 
     def __repr__(self):
         """
@@ -133,7 +401,7 @@ class RN:
     def __int__(self):
         """
         Integer cast to RN value, if no op, returns its only term
-        else, truncate float(self), which actually calculate RN value recursively
+        else, truncate float(self), which actually calculate RN value
         executing the operations related to self and each term of self
 
         :return: Integer
@@ -144,23 +412,102 @@ class RN:
     def __float__(self):
         """
         Float cast to RN value, if no op, returns its only terms cast to float
-        else, recursively calculate the value of the RN by going up the different
+        else, calculate the value of the RN by going up the different
         level of complexity in the representation of RN
 
+        The terms tree is walked iteratively: the compiled code of self (see _compile) is run
+        on a values stack, so deep RNs do not hit the interpreter recursion limit.
+        The value is calculated once and then cached on the instance (and on each RN of its terms tree).
+
         :return: Float
         """
 
-        if not self.op:
-            return float(self[0])
-        else:
-            flt_terms = tuple(map(lambda x: float(x), self.terms))
-            func = self.op.__name__.lower() if not issubclass(self.op, ArithmeticOperation) \
-                else '__' + self.op.__name__.lower() + '__'
-            if func == '__matmul__':
-                return flt_terms[0] ** (1 / flt_terms[1])
+        value = self._fcache
+        if value is None:
+            value = self._fcache = float(self[0]) if not self.op else _run_code(self._compile())
+        return value
+
+    def _compile(self):
+        """
+        Compile the terms tree of self into a post-order sequence of instructions, for _run_code:
+        - (None, value): push value, used for simple RNs, int terms and RNs whose value is already known
+        - (op, rn): pop the values of the terms of rn and push the result of op performed on them
+
+        The tree is walked with an explicit stack, each node is visited twice: first to push its terms,
+        then, after them, to emit its own instruction. The code is built once and cached on the instance.
+
+        :return: tuple of instructions
+        """
+
+        code = self._code
+        if code is None:
+            instructions = []
+            stack = [(self, False)]
+            while stack:
+                node, expanded = stack.pop()
+                if not isinstance(node, RN):
+                    # int term stored directly in an op RN
+                    instructions.append((None, float(node)))
+                elif node._fcache is not None:
+                    instructions.append((None, node._fcache))
+                elif not node.op:
+                    instructions.append((None, float(node.terms[0])))
+                elif expanded:
+                    instructions.append((node.op, node))
+                else:
+                    stack.append((node, True))
+                    stack.extend((term, False) for term in reversed(node.terms))
+            code = self._code = tuple(instructions)
+        return code
+
+    def compile_float(self):
+        """
+        Return a function calculating the float value of self, without walking
+        its terms tree again: the tree is compiled once (see _compile) and the returned function
+        only runs the instructions.
+
+        :return: function with no arguments returning a Float
+        """
+
+        return partial(_run_code, self._compile())
+
+    def leaves(self):
+        """
+        Integers of self, in the order they are written, whose values are
+        the arguments of the functions returned by as_njit_callable
+
+        :return: tuple of ints
+        """
+
+        return _njit_source(self)[1]
+
+    def as_njit_callable(self):
+        """
+        Return a function f(values) calculating the float value of the terms tree of self,
+        with its leaves (see leaves) replaced by values, a sequence of floats (a numpy array when jitted),
+        so the same tree can be evaluated many times for different leaves without walking it again.
+
+        The function is compiled with numba.njit when numba is installed, else it is a plain python function.
+        Functions are cached by structure: RNs with the same operations share the same function.
+
+        :return: function taking a sequence of floats, returning a Float
+        """
+
+        source = _njit_source(self)[0]
+        function = _NJIT_CACHE.get(source)
+        if function is None:
+            namespace = {}
+            exec(source, namespace)
+            function = namespace['f']
+            # numba is optional, and only imported here, so that importing rn does not load it
+            try:
+                from numba import njit
+            except ImportError:
+                pass
             else:
-                code_fragment = 'flt_terms[0].' + func + ('(*flt_terms[1:])' if flt_terms[1:] else '()')
-                return float(eval(code_fragment))
+                function = njit(function)
+            _NJIT_CACHE[source] = function
+        return function
 
     def __bool__(self):
         """
@@ -172,6 +519,30 @@ class RN:
 
         return self != 0
 
+    def __hash__(self):
+        """
+        hash(self)
+
+        Simple RNs hash as their integer, so that RN(n) and n, which compare equal, have the same hash.
+        The other RNs hash their op and the identities of their RN terms: equal terms are the same
+        objects (see RN.__new__), so the terms tree is not walked; the terms of commutative operations are
+        stored in a canonical order (see _operation_rn), so swapped sums and products hash the same.
+        Equal values built by different operations, like (1 + 2 √ 2) ** 2 and 3 + 2 * 2 √ 2, are different
+        RNs: they compare equal but are not guaranteed to be the same set or dict key.
+        The hash is cached on the instance.
+
+        :return: Integer
+        """
+
+        h = self._hash
+        if h is None:
+            if not self.op:
+                h = hash(self.terms[0])
+            else:
+                h = hash((self.op, *(term if isinstance(term, int) else id(term) for term in self.terms)))
+            self._hash = h
+        return h
+
     # faster terms getter
     def __getitem__(self, item):
         """
@@ -187,22 +558,32 @@ class RN:
         return self.terms[item]
 
     # equality
-    @_validate
     def __eq__(self, other):
         """
         self == other
 
-        Comparison is made by comparing float values of self and other
+        Comparison is made by comparing float values of self and other,
+        unless other is self: as equal RNs are unique (see RN.__new__), this is often the case.
+        RNs of the same op are compared by their terms first: simple RNs are compared exactly
+        by their integers, and op RNs with the same terms objects are equal.
 
         :param other: RN or int
         :return: Boolean
         """
 
+        if other is self:
+            return True
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__eq__')
+        if self.op is other.op:
+            if not self.op:
+                return self.terms[0] == other.terms[0]
+            if len(self.terms) == len(other.terms) and all(map(operator.is_, self.terms, other.terms)):
+                return True
         if float(self) == float(other):
             return True
         return False
 
-    @_validate
     def __ne__(self, other):
         """
         self != other
@@ -211,10 +592,13 @@ class RN:
         :return: Boolean
         """
 
+        if other is self:
+            return False
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__ne__')
         return not self == other
 
     # comparisons
-    @_validate
     def __gt__(self, other):
         """
         self > other
@@ -225,9 +609,10 @@ class RN:
         :return: Boolean
         """
 
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__gt__')
         return float(self) > float(other)
 
-    @_validate
     def __ge__(self, other):
         """
         self >= other
@@ -238,9 +623,10 @@ class RN:
         :return: Boolean
         """
 
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__ge__')
         return float(self) >= float(other)
 
-    @_validate
     def __lt__(self, other):
         """
         self < other
@@ -251,9 +637,10 @@ class RN:
         :return: Boolean
         """
 
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__lt__')
         return float(self) < float(other)
 
-    @_validate
     def __le__(self, other):
         """
         self <= other
@@ -264,6 +651,8 @@ class RN:
         :return: Boolean
         """
 
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__le__')
         return float(self) <= float(other)
 
     # types getters
@@ -281,98 +670,151 @@ class RN:
     # Arithmetic operations: add, sub, mul, truediv, floordiv, pow, root (using matmul for that) (binary operators)
     # + neg, pos and abs (unary operators)
 
-    # when the arguments make it to the actual function, they will always be RNs, as the decorator
-    # __validate will convert them if any integer is found
+    # each operation method turns other into an RN before performing the operation (see _operand),
+    # checking the class directly for the common case where it already is one
 
     def __neg__(self):
-        return self * -1
+        if not self.op:
+            return RN._make(None, (-self.terms[0], ))
+        return Mul._from_rns((self, _MINUS_ONE)).rv()
 
     def __pos__(self):
         return self
 
     def __abs__(self):
-        return self if self >= 0 else -self
+        return self if float(self) >= 0.0 else -self
 
-    @_validate
     def __add__(self, other):
         """
         self + other
 
-        :param other: RN (if int is turned to RN by __validate)
+        :param other: RN (if int is turned to RN by _operand)
         :return: RN object sum
         """
 
-        return Add(self, other).rv()
+        # integer fast path
+        if not self.op:
+            if other.__class__ is int:
+                return RN._make(None, (self.terms[0] + other, ))
+            if other.__class__ is RN and not other.op:
+                return RN._make(None, (self.terms[0] + other.terms[0], ))
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__add__')
+        return Add._from_rns((self, other)).rv()
 
-    @_validate
     def __radd__(self, other):
-        return Add(other, self).rv()
+        if not self.op and other.__class__ is int:
+            return RN._make(None, (other + self.terms[0], ))
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__radd__')
+        return Add._from_rns((other, self)).rv()
 
-    @_validate
     def __sub__(self, other):
         """
         self - other
 
-        :param other: RN (if int is turned to RN by __validate)
+        :param other: RN (if int is turned to RN by _operand)
         :return: RN object difference
         """
 
-        return Sub(self, other).rv()
+        # integer fast path
+        if not self.op:
+            if other.__class__ is int:
+                return RN._make(None, (self.terms[0] - other, ))
+            if other.__class__ is RN and not other.op:
+                return RN._make(None, (self.terms[0] - other.terms[0], ))
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__sub__')
+        return Sub._from_rns((self, other)).rv()
 
-    @_validate
     def __rsub__(self, other):
-        return Sub(other, self).rv()
+        if not self.op and other.__class__ is int:
+            return RN._make(None, (other - self.terms[0], ))
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__rsub__')
+        return Sub._from_rns((other, self)).rv()
 
-    @_validate
     def __mul__(self, other):
         """
         self * other
 
-        :param other: RN (if int is turned to RN by __validate)
+        :param other: RN (if int is turned to RN by _operand)
         :return: RN object product
         """
 
-        return Mul(self, other).rv()
+        # integer fast path
+        if not self.op:
+            if other.__class__ is int:
+                return RN._make(None, (self.terms[0] * other, ))
+            if other.__class__ is RN and not other.op:
+                return RN._make(None, (self.terms[0] * other.terms[0], ))
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__mul__')
+        return Mul._from_rns((self, other)).rv()
 
-    @_validate
     def __rmul__(self, other):
-        return Mul(other, self).rv()
+        if not self.op and other.__class__ is int:
+            return RN._make(None, (other * self.terms[0], ))
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__rmul__')
+        return Mul._from_rns((other, self)).rv()
 
-    @_validate
     def __truediv__(self, other):
         """
         self / other
 
         Validate: raise error if other == 0
 
-        :param other: RN (if int is turned to RN by __validate)
+        :param other: RN (if int is turned to RN by _operand)
         :return: RN object quotient
         """
 
+        # integer fast path (zero division is left to the TrueDiv validation)
+        if not self.op:
+            if other.__class__ is int:
+                if other:
+                    return _fraction(self.terms[0], other)
+            elif other.__class__ is RN and not other.op and other.terms[0]:
+                return _fraction(self.terms[0], other.terms[0])
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__truediv__')
         return TrueDiv(self, other).rv()
 
-    @_validate
     def __rtruediv__(self, other):
+        if not self.op and other.__class__ is int and self.terms[0]:
+            return _fraction(other, self.terms[0])
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__rtruediv__')
         return TrueDiv(other, self).rv()
 
-    @_validate
     def __floordiv__(self, other):
         """
         self // other
 
         Validate: raise error if other == 0
 
-        :param other: RN (if int is turned to RN by __validate)
+        :param other: RN (if int is turned to RN by _operand)
         :return: RN object exact quotient
         """
 
+        # integer fast path (zero division is left to the FloorDiv validation)
+        if not self.op:
+            if other.__class__ is int:
+                if other:
+                    return RN._make(None, (self.terms[0] // other, ))
+            elif other.__class__ is RN and not other.op and other.terms[0]:
+                return RN._make(None, (self.terms[0] // other.terms[0], ))
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__floordiv__')
         return FloorDiv(self, other).rv()
 
-    @_validate
     def __rfloordiv__(self, other):
+        if not self.op and other.__class__ is int and self.terms[0]:
+            return RN._make(None, (other // self.terms[0], ))
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__rfloordiv__')
         return FloorDiv(other, self).rv()
 
-    @_validate
     def __mod__(self, other):
         """
         self % other
@@ -383,13 +825,24 @@ class RN:
         :return:
         """
 
+        # integer fast path (zero division is left to the Mod validation)
+        if not self.op:
+            if other.__class__ is int:
+                if other:
+                    return RN._make(None, (self.terms[0] % other, ))
+            elif other.__class__ is RN and not other.op and other.terms[0]:
+                return RN._make(None, (self.terms[0] % other.terms[0], ))
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__mod__')
         return Mod(self, other).rv()
 
-    @_validate
     def __rmod__(self, other):
+        if not self.op and other.__class__ is int and self.terms[0]:
+            return RN._make(None, (other % self.terms[0], ))
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__rmod__')
         return Mod(other, self).rv()
 
-    @_validate
     def __pow__(self, power, modulo=None):
         """
         self ** power
@@ -401,13 +854,29 @@ class RN:
         :param modulo: None
         :return: RN object power
         """
+
+        # integer fast path for non negative exponents (0 ** 0 is left to the Pow validation)
+        if not self.op:
+            if power.__class__ is int:
+                if power > 0 or power == 0 and self.terms[0]:
+                    return RN._make(None, (self.terms[0] ** power, ))
+            elif power.__class__ is RN and not power.op:
+                exponent = power.terms[0]
+                if exponent > 0 or exponent == 0 and self.terms[0]:
+                    return RN._make(None, (self.terms[0] ** exponent, ))
+        if power.__class__ is not RN:
+            power = _operand(self, power, '__pow__')
         return Pow(self, power).rv()
 
-    @_validate
     def __rpow__(self, other, modulo=None):
+        if not self.op and other.__class__ is int:
+            exponent = self.terms[0]
+            if exponent > 0 or exponent == 0 and other:
+                return RN._make(None, (other ** exponent, ))
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__rpow__')
         return Pow(other, self).rv()
 
-    @_validate
     def __matmul__(self, other):
         """
         self@ other
@@ -420,15 +889,28 @@ class RN:
         :param other: Radicand
         :return: RN object root
         """
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__matmul__')
         return MatMul(self, other).rv()
 
-    @_validate
     def __rmatmul__(self, other):
+        if other.__class__ is not RN:
+            other = _operand(self, other, '__rmatmul__')
         return MatMul(other, self).rv()
 
 
+# unique RNs, used by RN.__new__: simple RNs are keyed by their integer, the others by
+# (op, *ids of their terms); entries are dropped when the RN is no longer referenced
+_RN_TABLE = WeakValueDictionary()
+
+# shared simple RNs of the small integers, used by RN.__new__
+_INT_CACHE = {}
+_INT_CACHE.update((n, RN(n)) for n in range(-128, 257))
+_MINUS_ONE = _INT_CACHE[-1]
+
+
 # Operation abstract class
-class Operation(metaclass=ABCMeta):
+class Operation:
     """
     Operation super - abstract class, interface that every operation class should follow:
     - OPERANDS_NUMBER attribute specifying how many terms are needed to perform the operation required
@@ -452,12 +934,30 @@ class Operation(metaclass=ABCMeta):
     """
 
     PERMITTED_OPERANDS = (int, RN)
+
+    # an operation instance only stores its terms (the subclasses declare empty __slots__)
+    __slots__ = ('terms',)
     # number of operands needed to perform operation
     # here set to NotImplemented but defined in subclasses
     OPERANDS_NUMBER = NotImplemented
     OPERATOR = NotImplemented
+    # id of the operation in ArithmeticOperation._TABLE, set for the operations of _OPERATION_NAMES;
+    # any other operation gets the last id, whose table slots are never filled (no operation method)
+    OPID = 15
     # operand properties
-    PROPERTIES = NotImplemented
+    COMMUTATIVE = False
+    ASSOCIATIVE = False
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Store the lower case name of the subclass (the one used in the operation methods names)
+        as _lname, so that it is not rebuilt from __name__ every time it is needed.
+
+        :return: None
+        """
+
+        super().__init_subclass__(**kwargs)
+        cls._lname = cls.__name__.lower()
 
     def __init__(self, *terms):
         """
@@ -469,36 +969,72 @@ class Operation(metaclass=ABCMeta):
         """
 
         self._validate_terms(terms)
-        self.terms = tuple(map(lambda x: x if isinstance(x, RN) else RN(x), terms))
+        self.terms = tuple(x if isinstance(x, RN) else RN(x) for x in terms)
+
+    @classmethod
+    def _from_rns(cls, terms):
+        """
+        Fast initialization used by the RN operation methods, where the terms are already
+        a tuple of RNs of the right number: skips terms validation and parsing.
+
+        Should only be used for operations that do not validate the value of their terms
+        (Add, Sub, Mul), as those checks (zero division...) are skipped too.
+
+        :param terms: tuple of RN operands
+        :return: operation instance
+        """
+
+        self = cls.__new__(cls)
+        self.terms = terms
+        return self
 
     def _validate_terms(self, terms):
         """
         Validate that the terms passed could be the operands of they operation type represented.
         If no, raise error.
 
+        The number / type checks are skipped when running with python -O, as the RN operation methods
+        already pass the right terms; the operation specific checks (zero division...) in the subclasses
+        are still performed.
+
         :param terms: RN operands
         :return: None
         """
 
+        if not __debug__:
+            return
         if len(terms) != self.OPERANDS_NUMBER:
             raise ValueError('Bad user argument, cannot perform operation {} with {} terms ({}), {} are needed'
                              .format(self.__class__.__name__, len(terms), terms, self.OPERANDS_NUMBER))
         for term in terms:
-            if not any(isinstance(term, tp) for tp in self.PERMITTED_OPERANDS):
-                raise ValueError('Bad user argument, operation {} can be performed only with types {},\n terms {}'
-                                 ' contains one or more invalid type/s '
-                                 .format(self.__class__.__name__, self.PERMITTED_OPERANDS, terms))
+            if not isinstance(term, self.PERMITTED_OPERANDS):
+                self._invalid_operands(terms)
+
+    def _invalid_operands(self, terms):
+        """
+        Raise the error for terms that are not of the PERMITTED_OPERANDS types.
+        Kept out of _validate_terms, so that the valid terms path stays as short as possible.
+
+        :param terms: RN operands
+        :return: None
+        """
+
+        raise ValueError('Bad user argument, operation {} can be performed only with types {},\n terms {}'
+                         ' contains one or more invalid type/s '
+                         .format(self.__class__.__name__, self.PERMITTED_OPERANDS, terms))
 
     @staticmethod
-    @abstractmethod
     def string(terms):
         """
         Return the string representation of the operation, using the terms passed.
+        Must be defined by every operation class.
 
         :param terms: operation terms
         :return: string representation
         """
 
+        raise NotImplementedError
+
     def rv(self):
         """
         Return the actual RN object resulting from the operation,
@@ -511,38 +1047,63 @@ class Operation(metaclass=ABCMeta):
         """
 
         # standard return value
-        return RN(op=self.__class__, *self.terms)
+        return RN._make(self.__class__, self.terms)
 
 
 # Arithmetic operations
 # -> Add, Sub, Mul, TrueDiv, FloorDiv, Pow, Root
-class ArithmeticOperation(Operation, ABC):
+
+# names used in the operation methods of the arithmetic operation classes ('none' for simple RNs),
+# the position of each name is the OPID of the operation class (see ArithmeticOperation._TABLE)
+_OPERATION_NAMES = ('none', 'add', 'sub', 'mul', 'truediv', 'floordiv', 'mod', 'pow', 'matmul')
+
+
+class ArithmeticOperation(Operation):
     """
-    ABC super class for arithmetic operations, like Add, Sub, Mul...
+    Super class for arithmetic operations, like Add, Sub, Mul...
     - define OPERANDS_NUMBER equal to 2
-    - define a string method builder common for most of the operations
+    - build the string method, common for most of the operations (terms joined by OPERATOR)
     - define a super rv method
     """
 
     OPERANDS_NUMBER = 2
-    PROPERTIES = []
 
-    def _validate_terms(self, terms):
-        super()._validate_terms(terms)
+    __slots__ = ()
 
-    @classmethod
-    def string_builder(cls):
+    # operation methods of the class, the method for the terms operations op_1, op_2
+    # is at the index op_1.OPID << 4 | op_2.OPID (OPID is 0 for simple RNs, see _OPERATION_NAMES)
+    _TABLE = [None] * 256
+
+    def __init_subclass__(cls, **kwargs):
         """
-        Returns a method that should return the string representation of the
-        operation passed (using the cls.OPERATOR attribute)
+        Set the OPID of the subclass (index of its name in _OPERATION_NAMES), and
+        collect the operation methods defined in the subclass (named 'op1_op2', see Operation DOC)
+        in the _TABLE list, so that rv does not need to look them up by name on every call.
 
-        :return: string representation getter
+        If the subclass does not define its own string method, build it from its OPERATOR:
+        the joint string is computed once here, instead of on every string call, and the
+        string of two terms is built by an f-string compiled for the joint.
+
+        :return: None
         """
 
-        def inner(terms):
-            joint = ' ' + cls.OPERATOR + ' '
-            return joint.join([str(term) for term in terms])
-        return inner
+        super().__init_subclass__(**kwargs)
+        if 'string' not in vars(cls):
+            cls._JOINT = ' ' + cls.OPERATOR + ' '
+            # binary terms (the most common case) are formatted by an f-string compiled for the class joint
+            _format_2 = eval("lambda a, b: f'{a}" + cls._JOINT + "{b}'")
+            cls.string = staticmethod(lambda terms, _joint=cls._JOINT, _format_2=_format_2:
+                                      _format_2(*terms) if len(terms) == 2 else _joint.join(map(str, terms)))
+        if cls._lname in _OPERATION_NAMES:
+            cls.OPID = _OPERATION_NAMES.index(cls._lname)
+        cls._TABLE = list(cls._TABLE)
+        for name in vars(cls):
+            op_1, _, op_2 = name.partition('_')
+            if op_1 in _OPERATION_NAMES and op_2 in _OPERATION_NAMES:
+                cls._TABLE[_OPERATION_NAMES.index(op_1) << 4 | _OPERATION_NAMES.index(op_2)] = getattr(cls, name)
+
+    def _validate_terms(self, terms):
+        super()._validate_terms(terms)
 
     def rv(self):
         """
@@ -555,24 +1116,101 @@ class ArithmeticOperation(Operation, ABC):
         :return: RN object
         """
 
+        # constant folding: if the terms are integers / integer fractions (at least a fraction,
+        # integers only are handled by the none_none methods) perform the operation exactly
+        fold = _RATIONAL_OPERATIONS.get(self.__class__)
+        if fold and (self.terms[0].op is TrueDiv or self.terms[1].op is TrueDiv):
+            rational_1 = _rational(self.terms[0])
+            rational_2 = _rational(self.terms[1])
+            if rational_1 and rational_2:
+                rational = fold(*rational_1, *rational_2)
+                if rational:
+                    return _fraction(*rational)
+
         # call operator method
         op_1 = self.terms[0].op
         op_2 = self.terms[1].op
-        op_1 = op_1.__name__.lower() if op_1 else 'none'
-        op_2 = op_2.__name__.lower() if op_2 else 'none'
-        try:
-            # try to call the operation method for the terms defined operations
-            return eval('self.' + op_1 + '_' + op_2 + '(*self.terms)')
-        except AttributeError:
-            # no operation method found
-            # -> if commutative properties
-            if 'commutative' in self.PROPERTIES:
+        id_1 = op_1.OPID if op_1 else 0
+        id_2 = op_2.OPID if op_2 else 0
+        # try to call the operation method for the terms defined operations
+        # (an AttributeError raised by the method means it cannot handle the terms, so it is treated as not found)
+        func = self._TABLE[id_1 << 4 | id_2]
+        if func:
+            try:
+                return func(*self.terms)
+            except AttributeError:
+                pass
+        # no operation method found
+        # -> if commutative properties
+        if self.COMMUTATIVE:
+            func = self._TABLE[id_2 << 4 | id_1]
+            if func:
                 try:
-                    func = eval('self.' + op_2 + '_' + op_1)
-                    return eval('self.' + op_2 + '_' + op_1 + '(*reversed(self.terms))')
+                    return func(*reversed(self.terms))
                 except AttributeError:
                     pass
-            return super().rv()
+        if self.ASSOCIATIVE:
+            return _operation_rn(self.__class__, self.terms)
+        return super().rv()
+
+
+def _operation_rn(op, terms):
+    """
+    Build the RN of the operation op with the terms passed (no validation, only called locally).
+
+    If op is associative (Add, Mul), the terms that are RNs of the same op are replaced by their own terms,
+    so that chains like a + b + c are stored in a single n-ary RN instead of nested ones (less levels to walk
+    when evaluating, printing or parsing the RN), and the integer terms are merged into a single one
+    (dropped if it is the neutral element of op).
+
+    :param op: operation class
+    :param terms: operation terms
+    :return: RN object
+    """
+
+    if not op.ASSOCIATIVE:
+        return RN._make(op, tuple(terms))
+    flat = []
+    for term in terms:
+        if isinstance(term, RN) and term.op is op:
+            flat.extend(term.terms)
+        else:
+            flat.append(term)
+    # merge integers
+    integers = [p for p, term in enumerate(flat) if isinstance(term, int) or not term.op]
+    if len(integers) > 1:
+        merge = operator.add if op is Add else operator.mul
+        value = reduce(merge, (flat[p] if isinstance(flat[p], int) else flat[p][0] for p in integers))
+        flat[integers[0]] = RN._make(None, (value, ))
+        for p in reversed(integers[1:]):
+            del flat[p]
+    # drop the merged integer if it is the neutral element of op (0 addend, 1 factor)
+    if integers and len(flat) > 1:
+        term = flat[integers[0]]
+        if (term if isinstance(term, int) else term[0]) == (0 if op is Add else 1):
+            del flat[integers[0]]
+    if len(flat) == 1:
+        return flat[0] if isinstance(flat[0], RN) else RN(flat[0])
+    # canonical order of commutative terms, so that a * b and b * a are the same RN (same hash)
+    if op.COMMUTATIVE:
+        flat.sort(key=_term_order)
+    return RN._make(op, tuple(flat))
+
+
+def _term_order(term):
+    """
+    Sort key of the terms of a commutative operation: integers first (by value), then the other terms
+    by operation name and by the keys of their own terms, so that equal terms always get the same key.
+
+    :param term: operation term
+    :return: sort key
+    """
+
+    if isinstance(term, int):
+        return 0, term
+    if not term.op:
+        return 0, term.terms[0]
+    return 1, term.op._lname, tuple(_term_order(t) for t in term.terms)
 
 
 # possible data parsing in operation:
@@ -595,67 +1233,82 @@ def _complexity_level(_cls):
     def inner(a, b):
         # No validation needed, as this method is only called locally
         data = (a, b)
-        return RN(op=_cls, *data)
+        return _operation_rn(_cls, data)
     return inner
-def _sum_sub_parsing(_cls):
+def _sum_sub_parsing(_cls, a, b):
     """
     Operation parsing involving sums or subs,
     will parse the terms involved in the actual operation
     and try merge them.
 
-    Will have to specify where both the operands are sum / sub or only one.
+    The second operand is the sum / sub (see _ssp_add, _ssp_sub).
+
+    -> sum data parsing
+        list every term in the sum (considering that sum may involve more than one term)
+        - loop sum terms, if term is a sum -> parse, else add to list
+        if any of the terms in list is compatible to the int, add it
+        Re build new sum object if merging has been done
+
+    Compatibility check:
+    if a + term is not a sum, merge
+
+    Example:
+    3 + (√3 + 4) --> list = [Root 3, 4] where for is compatible with 3 (both integer)
+    -> √3 + 7
 
     :return: RN object
     """
 
     # will assume classes passed are the right ones with the right methods defined
+    terms = [a] + _cls._parse_sum(b)
+    return _cls._sum_terms(_cls._merge_sum(terms))
 
-    def inner(_a: bool, _b: bool):
-        def double_inner(a, b):
-            """
-            -> sum data parsing
-                list every term in the sum (considering that sum may involve more than one term)
-                - loop sum terms, if term is a sum -> parse, else add to list
-                if any of the terms in list is compatible to the int, add it
-                Re build new sum object if merging has been done
-
-            Compatibility check:
-            if a + term is not a sum, merge
-
-            Example:
-            3 + (√3 + 4) --> list = [Root 3, 4] where for is compatible with 3 (both integer)
-            -> √3 + 7
-            """
-            terms = []
-            terms += _cls._parse_sum(a) if _a else [a]
-            terms += _cls._parse_sum(b) if _b else [b]
-            return _cls._sum_terms(_cls._merge_sum(terms))
-        return double_inner
-    return inner
-def _fractional_sum(_a: bool, _b: bool):
+
+def _fractional_sum_a(a, b):
     """
-    Operation involving fractions (TrueDiv objects)
+    Operation involving fractions (TrueDiv objects), where a is a fraction:
+    will bring everything on a single fraction and sum the terms there.
 
-    Will bring everything on a single fraction and sum the terms
-    there.
+    num_a + b * den_a / den_a
 
-    Need to specify which operands are fractions
+    :param a: First RN (fraction)
+    :param b: Second RN
+    :return: RN object
+    """
+
+    return TrueDiv(a[0] + b * a[1], a[1]).rv()
+
+
+def _fractional_sum_b(a, b):
+    """
+    Operation involving fractions (TrueDiv objects), where b is a fraction:
+    will bring everything on a single fraction and sum the terms there.
+
+    a * den_b + num_b / den_b
 
-    :param _a: First RN
-    :param _b: Second RN
+    :param a: First RN
+    :param b: Second RN (fraction)
     :return: RN object
     """
 
-    def inner(a, b):
-        # hardcoded logic
-        if not _b:
-            return TrueDiv(a[0] + b * a[1], a[1]).rv()
-        if not _a:
-            return TrueDiv(b[0] + a * b[1], b[1]).rv()
-        else:
-            return TrueDiv(a[0] * b[1] + a[1] * b[0], a[1] * b[1]).rv()
+    return TrueDiv(b[0] + a * b[1], b[1]).rv()
+
+
+def _fractional_sum_ab(a, b):
+    """
+    Operation involving fractions (TrueDiv objects), where both a and b are fractions:
+    will bring everything on a single fraction and sum the terms there.
+
+    num_a * den_b + den_a * num_b / den_a * den_b
+
+    :param a: First RN (fraction)
+    :param b: Second RN (fraction)
+    :return: RN object
+    """
+
+    return TrueDiv(a[0] * b[1] + a[1] * b[0], a[1] * b[1]).rv()
+
 
-    return inner
 def _addends_merge(a, b):
     """
     Operation involving two equal addends
@@ -668,9 +1321,9 @@ def _addends_merge(a, b):
 
     if a == b:
         data = (2, a)
-        return RN(op=Mul, *data)
+        return _operation_rn(Mul, data)
     data = (a, b)
-    return RN(op=Add, *data)
+    return _operation_rn(Add, data)
 
 
 def _cl_add(a, b):
@@ -680,41 +1333,43 @@ def _cl_add(a, b):
     return _complexity_level(Add)(a, b)
 
 
-def _ssp_add(_a, _b):
+def _ssp_add(a, b):
     """
     Sum Sub Parsing for Add class
     """
-    return _sum_sub_parsing(Add)
+    return _sum_sub_parsing(Add, a, b)
 
 
 class Add(ArithmeticOperation):
 
     OPERATOR = '+'
-    PROPERTIES = ['commutative']
-
-    @staticmethod
-    def string(terms):
-        return Add.string_builder()(terms)
+    COMMUTATIVE = True
+    ASSOCIATIVE = True
+    __slots__ = ()
 
     @staticmethod
     def _parse_sum(_sum):
         """
         Returns the list of terms involved in the sum / sub
 
+        The nested sums / subs are walked with an explicit stack of (term, subtracted) pairs,
+        pushed in reverse order so that they are popped in the order they are written.
+
         :param _sum: RN sum / sub
         :return: terms list
         """
         _list = []
 
         # get sum / sub terms
-        for p, term in enumerate(_sum.terms):
+        stack = [(term, _sum.op is Sub and p == 1) for p, term in enumerate(_sum.terms)][::-1]
+        while stack:
+            term, subtracted = stack.pop()
             if term.op in (Add, Sub):
-                _list.extend(Add._parse_sum(term))
+                stack.extend([(t, term.op is Sub and p == 1) for p, t in enumerate(term.terms)][::-1])
+            elif subtracted:
+                _list.append(-term)
             else:
-                if _sum.op == Sub and p == 1:
-                    _list.append(-term)
-                else:
-                    _list.append(term)
+                _list.append(term)
         return _list
 
     @staticmethod
@@ -723,27 +1378,25 @@ class Add(ArithmeticOperation):
         Returns the parsed terms of the sum / sub,
         merging the terms that can be merged
 
+        The terms are grouped by _merge_key, which is the same for the terms that may be merged
+        (rationals, equal roots and their multiples...), so sums are only tried inside each group:
+        each term is added to the last term of its group, and kept apart if their sum is not merged.
+        As RNs are unique (see RN.__new__) and never modified, the result is cached for the same terms.
+
         :param terms: sum / sub terms (use Add._parse_sum to get them)
         :return: terms list (parsed)
         """
 
-        # sort by op class name (if terms can be merged, they have the same op)
-        terms = sorted(terms, key=lambda x: x.op.__name__.lower() if x.op else 'none')
-        for p, term in enumerate(terms):
-            try:
-                _sum = term + terms[p + 1]
-                if _sum.op != Add:
-                    terms[p] = None
-                    terms[p + 1] = _sum
-            except IndexError:
-                continue
-        return [term for term in terms if term]
+        return list(_merged_terms(tuple(terms)))
 
     @staticmethod
     def _sum_terms(terms):
         """
         Sum up parsed sum terms
 
+        The terms are already merged (see _merge_sum), so they are stored as they are
+        in a single n-ary Add RN (see _operation_rn), without adding them up again one by one.
+
         :param terms: Addends
         :return: RN object sum
         """
@@ -752,13 +1405,7 @@ class Add(ArithmeticOperation):
             return RN(0)
         elif len(terms) == 1:
             return terms[0]
-        rv = 0
-        for p, term in enumerate(terms):
-            if p == 0:
-                rv = term + terms[1]
-            elif p != 1:
-                rv += term
-        return rv
+        return _operation_rn(Add, terms)
 
     # operations explicit declarations
     @staticmethod
@@ -771,18 +1418,18 @@ class Add(ArithmeticOperation):
         :return: RN object
         """
 
-        return RN(a[0] + b[0])
+        return RN._make(None, (a.terms[0] + b.terms[0], ))
 
-    none_add = staticmethod(_ssp_add(False, True))
-    none_sub = staticmethod(_ssp_add(False, True))
+    none_add = staticmethod(_ssp_add)
+    none_sub = staticmethod(_ssp_add)
     none_mul = staticmethod(_cl_add)
-    none_truediv = staticmethod(_fractional_sum(True, False))
+    none_truediv = staticmethod(_fractional_sum_b)
     none_floordiv = staticmethod(_cl_add)
     none_mod = staticmethod(_cl_add)
     none_pow = staticmethod(_cl_add)
     none_matmul = staticmethod(_cl_add)
-    add_add = staticmethod(_ssp_add(False, True))
-    add_sub = staticmethod(_ssp_add(False, True))
+    add_add = staticmethod(_ssp_add)
+    add_sub = staticmethod(_ssp_add)
     add_mul = staticmethod(_cl_add)
 
     @staticmethod
@@ -798,23 +1445,23 @@ class Add(ArithmeticOperation):
         :return: RN object
         """
 
-        terms = Add._parse_sum(a * b[1]) + [b[0]]
+        terms = [term * b[1] for term in Add._parse_sum(a)] + [b[0]]
         # sum num terms and return fraction
-        return TrueDiv(Add._sum_terms(terms), a[1]).rv()
+        return TrueDiv(Add._sum_terms(Add._merge_sum(terms)), b[1]).rv()
 
     add_floordiv = staticmethod(_cl_add)
     add_mod = staticmethod(_cl_add)
     add_pow = staticmethod(_cl_add)
-    add_matmul = staticmethod(_ssp_add(False, True))
-    sub_sub = staticmethod(_ssp_add(False, True))
+    add_matmul = staticmethod(_ssp_add)
+    sub_sub = staticmethod(_ssp_add)
     sub_mul = staticmethod(_cl_add)
-    sub_truediv = staticmethod(_fractional_sum(True, False))
+    sub_truediv = staticmethod(_fractional_sum_b)
     sub_floordiv = staticmethod(_cl_add)
     sub_mod = staticmethod(_cl_add)
     sub_pow = staticmethod(_cl_add)
-    sub_matmul = staticmethod(_ssp_add(False, True))
+    sub_matmul = staticmethod(_ssp_add)
     mul_mul = staticmethod(_cl_add)
-    mul_truediv = staticmethod(_fractional_sum(True, False))
+    mul_truediv = staticmethod(_fractional_sum_b)
     mul_floordiv = staticmethod(_cl_add)
     mul_pow = staticmethod(_cl_add)
 
@@ -823,26 +1470,29 @@ class Add(ArithmeticOperation):
         """
         Mul + Root
 
-        if one of the terms in Mul is equal to Root,
-        merge
+        if Mul is an integer coefficient times Root (in any order, -Root is stored as Root * -1),
+        merge into (coefficient + 1) * Root
 
         :return: RN object
         """
 
-        data = (a, b)
-        if a[0] == b and not a[1].op:
-            data = (a[1] + 1, b)
-        elif a[1] == b and not a[0].op:
-            data = (a[0] + 1, b)
-        if data[0].op == Add:
-            data = (a, b)
-        return RN(op=Add, *data)
-
-    truediv_truediv = staticmethod(_fractional_sum(True, False))
-    truediv_floordiv = staticmethod(_fractional_sum(True, False))
-    truediv_mod = staticmethod(_fractional_sum(True, False))
-    truediv_pow = staticmethod(_fractional_sum(True, False))
-    truediv_matmul = staticmethod(_fractional_sum(True, False))
+        # only a product of two terms can be a coefficient times the root (products are n-ary)
+        if len(a.terms) == 2:
+            coefficient, term = a.terms
+            if term is not b:
+                coefficient, term = term, coefficient
+            if term is b and (isinstance(coefficient, int) or not coefficient.op):
+                coefficient = (coefficient if isinstance(coefficient, int) else coefficient[0]) + 1
+                if not coefficient:
+                    return RN._make(None, (0, ))
+                return _operation_rn(Mul, (RN._make(None, (coefficient, )), b))
+        return _operation_rn(Add, (a, b))
+
+    truediv_truediv = staticmethod(_fractional_sum_ab)
+    truediv_floordiv = staticmethod(_fractional_sum_a)
+    truediv_mod = staticmethod(_fractional_sum_a)
+    truediv_pow = staticmethod(_fractional_sum_a)
+    truediv_matmul = staticmethod(_fractional_sum_a)
     floordiv_floordiv = staticmethod(_addends_merge)
     floordiv_mod = staticmethod(_cl_add)
     floordiv_pow = staticmethod(_cl_add)
@@ -862,19 +1512,16 @@ def _cl_sub(a, b):
     return _complexity_level(Sub)(a, b)
 
 
-def _ssp_sub(_a, _b):
+def _ssp_sub(a, b):
     """
-    Sum Sub Parsing for Add class
+    Sum Sub Parsing for Sub class
     """
-    return _sum_sub_parsing(Sub)
+    return _sum_sub_parsing(Sub, a, b)
 
 
 class Sub(ArithmeticOperation):
     OPERATOR = '-'
-
-    @staticmethod
-    def string(terms):
-        return Sub.string_builder()(terms)
+    __slots__ = ()
 
     # operations explicit declarations
 
@@ -943,7 +1590,7 @@ class Sub(ArithmeticOperation):
         :return: RN object
         """
 
-        return RN(a[0] - b[0])
+        return RN._make(None, (a.terms[0] - b.terms[0], ))
 
     @staticmethod
     def none_add(a, b):
@@ -955,7 +1602,7 @@ class Sub(ArithmeticOperation):
         :return: RN object
         """
 
-        return _ssp_sub(False, True)(a, b)
+        return _ssp_sub(a, b)
 
     @staticmethod
     def none_sub(a, b):
@@ -1592,15 +2239,13 @@ class Sub(ArithmeticOperation):
 
 class Mul(ArithmeticOperation):
     OPERATOR = '*'
-    PROPERTIES = ['commutative']
-
-    @staticmethod
-    def string(terms):
-        return Mul.string_builder()(terms)
+    COMMUTATIVE = True
+    ASSOCIATIVE = True
+    __slots__ = ()
 
     @staticmethod
     def none_none(a, b):
-        return RN(a[0] * b[0])
+        return RN._make(None, (a.terms[0] * b.terms[0], ))
 
     @staticmethod
     def truediv_none(a, b):
@@ -1612,6 +2257,10 @@ class Mul(ArithmeticOperation):
         :return: RN object
         """
 
+        num, den = a.terms
+        if not (num.op or den.op):
+            # integer fraction, reduce directly
+            return _fraction(*_fraction_product(num[0], den[0], b[0], 1))
         data = (a[0] * b[0], a[1])
         return TrueDiv(*data).rv()
 
@@ -1624,10 +2273,16 @@ class Mul(ArithmeticOperation):
         """
         fraction * fraction:
         - num1 * num2, den1 * den2
+        - reduce the products once (see _fraction_product)
 
         :return: RN object
         """
 
+        num_1, den_1 = a.terms
+        num_2, den_2 = b.terms
+        if not (num_1.op or den_1.op or num_2.op or den_2.op):
+            # integer fractions, reduce directly
+            return _fraction(*_fraction_product(num_1[0], den_1[0], num_2[0], den_2[0]))
         data = (a[0] * b[0], a[1] * b[1])
         return TrueDiv(*data).rv()
 
@@ -1643,12 +2298,14 @@ class Mul(ArithmeticOperation):
         :return: RN object
         """
 
-        _lcm = int(lcm(a[0], b[0]))
-        return MatMul(_lcm, (a[1] ** (_lcm // a[0])) * (b[1] ** (_lcm // b[0]))).rv()
+        index_1, index_2 = int(a[0]), int(b[0])
+        _lcm = index_1 * index_2 // _gcd(index_1, index_2)
+        return MatMul(_lcm, (a[1] ** (_lcm // index_1)) * (b[1] ** (_lcm // index_2))).rv()
 
 
 class TrueDiv(ArithmeticOperation):
     OPERATOR = '/'
+    __slots__ = ()
 
     def _validate_terms(self, terms):
         """
@@ -1659,13 +2316,9 @@ class TrueDiv(ArithmeticOperation):
         :return:
         """
         super()._validate_terms(terms)
-        if terms[1] == 0:
+        if _is_zero(terms[1]):
             raise ZeroDivisionError('Bad user argument, cannot divide by zero')
 
-    @staticmethod
-    def string(terms):
-        return TrueDiv.string_builder()(terms)
-
     @staticmethod
     def none_none(a, b):
         """
@@ -1673,11 +2326,7 @@ class TrueDiv(ArithmeticOperation):
 
         :return: RN object
         """
-        num, den = reduce_fraction(a[0], b[0])
-        if den == 1:
-            return RN(num)
-        data = (RN(num), RN(den))
-        return RN(op=TrueDiv, *data)
+        return _fraction(a.terms[0], b.terms[0])
 
     @staticmethod
     def truediv_none(a, b):
@@ -1715,6 +2364,7 @@ class TrueDiv(ArithmeticOperation):
 
 class FloorDiv(ArithmeticOperation):
     OPERATOR = '//'
+    __slots__ = ()
 
     def _validate_terms(self, terms):
         """
@@ -1725,16 +2375,12 @@ class FloorDiv(ArithmeticOperation):
         :return:
         """
         super()._validate_terms(terms)
-        if terms[1] == 0:
+        if _is_zero(terms[1]):
             raise ZeroDivisionError('Bad user argument, cannot divide by zero')
 
-    @staticmethod
-    def string(terms):
-        return FloorDiv.string_builder()(terms)
-
     @staticmethod
     def none_none(a, b):
-        return RN(a[0] // b[0])
+        return RN._make(None, (a.terms[0] // b.terms[0], ))
 
     @staticmethod
     def truediv_none(a, b):
@@ -1744,8 +2390,7 @@ class FloorDiv(ArithmeticOperation):
         :return: RN object
         """
 
-        data = (float(a) // b[0], )
-        return RN(*data)
+        return FloorDiv._quotient(a, b)
 
     @staticmethod
     def none_truediv(a, b):
@@ -1755,8 +2400,7 @@ class FloorDiv(ArithmeticOperation):
         :return: RN object
         """
 
-        data = (a[0] // float(b), )
-        return RN(*data)
+        return FloorDiv._quotient(a, b)
 
     @staticmethod
     def truediv_truediv(a, b):
@@ -1766,12 +2410,31 @@ class FloorDiv(ArithmeticOperation):
         :return: RN object
         """
 
-        data = (float(a) // float(b), )
-        return RN(*data)
+        return FloorDiv._quotient(a, b)
+
+    @staticmethod
+    def _quotient(a, b):
+        """
+        Integer quotient of a // b:
+        exact (n1 * d2) // (d1 * n2) if both are integers or fractions of integers,
+        else the floor of the quotient of their float values
+
+        :param a: RN dividend
+        :param b: RN divisor
+        :return: simple RN object
+        """
+
+        rational_1 = _rational(a)
+        rational_2 = _rational(b)
+        if rational_1 and rational_2:
+            (num_1, den_1), (num_2, den_2) = rational_1, rational_2
+            return RN._make(None, ((num_1 * den_2) // (den_1 * num_2), ))
+        return RN._make(None, (math.floor(float(a) / float(b)), ))
 
 
 class Mod(ArithmeticOperation):
     OPERATOR = '%'
+    __slots__ = ()
 
     def _validate_terms(self, terms):
         """
@@ -1783,14 +2446,10 @@ class Mod(ArithmeticOperation):
         """
 
         super()._validate_terms(terms)
-        if terms[1] == 0:
+        if _is_zero(terms[1]):
             raise ValueError('Unable to operate {} with {} and zero'
                              .format(self.__class__.__name__, terms[0]))
 
-    @staticmethod
-    def string(terms):
-        return Mod.string_builder()(terms)
-
     @staticmethod
     def none_none(a, b):
         """
@@ -1799,11 +2458,12 @@ class Mod(ArithmeticOperation):
         :return: RN object mod
         """
 
-        return a[0] % b[0]
+        return RN._make(None, (a.terms[0] % b.terms[0], ))
 
 
 class Pow(ArithmeticOperation):
     OPERATOR = '**'
+    __slots__ = ()
 
     def __init__(self, *terms):
         """
@@ -1829,16 +2489,12 @@ class Pow(ArithmeticOperation):
         """
 
         super()._validate_terms(terms)
-        if terms[0] == 0 and terms[1] == 0:
+        if _is_zero(terms[0]) and _is_zero(terms[1]):
             raise ValueError('Unable to perform 0^0')
         elif terms[0] < 0 and not terms[1].is_rational:
             raise ValueError('Unable to calculate operation {} with negative base {} and real exponent {}'
                              .format(self.__class__.__name__, terms[0], terms[1]))
 
-    @staticmethod
-    def string(terms):
-        return Pow.string_builder()(terms)
-
     @staticmethod
     def none_none(a, b):
         """
@@ -1847,7 +2503,7 @@ class Pow(ArithmeticOperation):
         :return: RN object
         """
 
-        return RN(a[0] ** b[0])
+        return RN._make(None, (a.terms[0] ** b.terms[0], ))
 
     @staticmethod
     def truediv_none(a, b):
@@ -1912,6 +2568,7 @@ class Pow(ArithmeticOperation):
 
 class MatMul(ArithmeticOperation):
     OPERATOR = '√'
+    __slots__ = ()
 
     def _validate_terms(self, terms):
         """
@@ -1929,17 +2586,13 @@ class MatMul(ArithmeticOperation):
         if terms[0] % 2 == 0 and terms[1] < 0:
             raise ValueError('Unable to perform {} of even index {} and negative radicand {}'
                              .format(self.__class__.__name__, terms[0], terms[1]))
-        elif terms[0] == 0:
+        elif _is_zero(terms[0]):
             raise ValueError('Unable to perform {} of zero index and radicand {}'
                              .format(self.__class__.__name__, terms[1]))
-        elif terms[0] < 0 and terms[1] == 0:
+        elif terms[0] < 0 and _is_zero(terms[1]):
             raise ValueError('Unable to perform {} of negative index {} and zero radicand'
                              .format(self.__class__.__name__, terms[0]))
 
-    @staticmethod
-    def string(terms):
-        return MatMul.string_builder()(terms)
-
     @staticmethod
     def none_none(a, b):
         """
@@ -1955,20 +2608,26 @@ class MatMul(ArithmeticOperation):
         """
 
         radicand, index, sign = b[0], a[0], False
-        if b < 0:
+        if radicand < 0:
             radicand = -radicand
             sign = True
-        root = radicand ** (1 / index)
-        if int(root) == round(root, 5):
-            return RN(int(root)) if not sign else RN(-int(root))
+        if index > 0:
+            root, exact = _iroot(radicand, index)
+        else:
+            # negative index: 1 / root, an integer only for radicand = 1
+            root, exact = 1, radicand == 1
+        if exact:
+            return RN._make(None, (-root if sign else root, ))
         else:
-            # reduce root
+            # reduce root (of abs(radicand), the sign goes to the factor out of the root)
             mul_factor, index, radicand = reduce_root(index, radicand)
+            if sign:
+                mul_factor = -mul_factor
             data = (index, radicand)
             if mul_factor != 1:
-                data = (mul_factor, RN(op=MatMul, *data))
-                return RN(op=Mul, *data)
-            return RN(op=MatMul, *data)
+                data = (mul_factor, RN._make(MatMul, data))
+                return RN._make(Mul, data)
+            return RN._make(MatMul, data)
 
     @staticmethod
     def none_truediv(a, b):
@@ -1983,7 +2642,7 @@ class MatMul(ArithmeticOperation):
         """
 
         data = (MatMul(a, b[0]).rv(), MatMul(a, b[1]).rv())
-        return RN(op=TrueDiv, *data)
+        return RN._make(TrueDiv, data)
 
     @staticmethod
     def truediv_none(a, b):
@@ -2020,7 +2679,7 @@ class MatMul(ArithmeticOperation):
         """
 
         data = (a * b[0], b[1])
-        return RN(op=MatMul, *data)
+        return RN._make(MatMul, data)
 
     @staticmethod
     def truediv_matmul(a, b):
@@ -2034,3 +2693,45 @@ class MatMul(ArithmeticOperation):
         """
 
         return MatMul(a * b[0], b[1]).rv()
+
+
+# float operation of each operation class, used to calculate RN float values
+_FLOAT_OPERATIONS = {
+    # Add and Mul RNs can have more than 2 terms (see _operation_rn)
+    Add: lambda *terms: math.fsum(terms),
+    Sub: operator.sub,
+    Mul: lambda *terms: math.prod(terms),
+    TrueDiv: operator.truediv,
+    FloorDiv: operator.floordiv,
+    Mod: operator.mod,
+    Pow: operator.pow,
+    MatMul: lambda index, radicand: radicand ** (1 / index),
+}
+
+
+# exact operation of each operation class between two fractions of integers (num_1, den_1, num_2, den_2),
+# returning (num, den), or None if the result is not rational, used to fold constant operations
+_RATIONAL_OPERATIONS = {
+    Add: lambda n1, d1, n2, d2: (n1 * d2 + n2 * d1, d1 * d2),
+    Sub: lambda n1, d1, n2, d2: (n1 * d2 - n2 * d1, d1 * d2),
+    Mul: _fraction_product,
+    TrueDiv: lambda n1, d1, n2, d2: (n1 * d2, d1 * n2),
+    FloorDiv: lambda n1, d1, n2, d2: ((n1 * d2) // (d1 * n2), 1),
+    Mod: lambda n1, d1, n2, d2: ((n1 * d2) % (n2 * d1), d1 * d2),
+    Pow: lambda n1, d1, n2, d2: (n1 ** n2, d1 ** n2) if d2 == 1 and n2 >= 0 else None,
+}
+
+
+# source of the float operation performed by each operation class on its terms names,
+# used to generate the functions of RN.as_njit_callable (see _njit_source)
+_SOURCE_OPERATIONS = {
+    Add: lambda *terms: ' + '.join(terms),
+    Sub: '{} - {}'.format,
+    Mul: lambda *terms: ' * '.join(terms),
+    TrueDiv: '{} / {}'.format,
+    FloorDiv: '{} // {}'.format,
+    Mod: '{} % {}'.format,
+    Pow: '{} ** {}'.format,
+    MatMul: '{1} ** (1.0 / {0})'.format,
+}
+
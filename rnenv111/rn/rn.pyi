@@ -1,8 +1,7 @@
 """
 rn.py stubs
 """
-from abc import ABCMeta, abstractmethod, ABC
-from typing import Tuple, Callable
+from typing import Tuple, Callable, List, Sequence
 
 
 class RN:
@@ -10,15 +9,26 @@ class RN:
 
     op = ...  # type: None or type
     terms = ...  # type: Tuple[int or RN, ...]
+    _str = ...  # type: None or str
+    _fcache = ...  # type: None or float
+    _code = ...  # type: None or Tuple[Tuple[None or type, float or RN], ...]
+    _hash = ...  # type: None or int
 
-    def __init__(self, op: None or type=None, *terms: Tuple[int or RN]) -> object: ...
+    def __new__(cls, *terms: Tuple[int or RN], op: None or type=None) -> RN: ...
+    @classmethod
+    def _make(cls, op: None or type, terms: Tuple[int or RN, ...]) -> RN: ...
     # string representations
     def __str__(self) -> str: ...
     def __repr__(self) -> str: ...
     # data casing
     def __int__(self) -> int: ...
     def __float__(self) -> float: ...
+    def _compile(self) -> Tuple[Tuple[None or type, float or RN], ...]: ...
+    def compile_float(self) -> Callable[[], float]: ...
+    def leaves(self) -> Tuple[int, ...]: ...
+    def as_njit_callable(self) -> Callable[[Sequence[float]], float]: ...
     def __bool__(self) -> bool: ...
+    def __hash__(self) -> int: ...
     # fast term getter
     def __getitem__(self, item: int) -> RN or int: ...
     # equality
@@ -66,23 +76,30 @@ class RN:
     # exponential functions
     def exp(self, other: RN or int) -> RN: ...
     def log(self, other: RN or int) -> RN: ...
-class Operation(metaclass=ABCMeta):
+class Operation:
     PERMITTED_OPERANDS = (int, RN)  # type: Tuple[type, ...]
     OPERANDS_NUMBER = ...  # type: int
     OPERATOR = ...  # type: str
-    PROPERTIES = ...  #type: List[str, ...]
+    OPID = ...  # type: int
+    COMMUTATIVE = ...  # type: bool
+    ASSOCIATIVE = ...  # type: bool
+    _lname = ...  # type: str
 
     terms = ...  # type: Tuple[RN, ...]
 
+    def __init_subclass__(cls, **kwargs) -> None: ...
     def __init__(self, *terms): ...
+    @classmethod
+    def _from_rns(cls, terms: Tuple[RN, ...]) -> Operation: ...
     def _validate_terms(self, terms: Tuple[int or RN, ...]) -> None: ...
+    def _invalid_operands(self, terms: Tuple[int or RN, ...]) -> None: ...
     @staticmethod
-    @abstractmethod
     def string(terms: Tuple[int or RN, ...]) -> str: ...
     def rv(self) -> RN: ...
-class ArithmeticOperation(Operation ,ABC):
+class ArithmeticOperation(Operation):
     OPERANDS_NUMBER = 2  # type: int
+    _TABLE = ...  # type: List[None or Callable]
+    def __init_subclass__(cls, **kwargs) -> None: ...
     def _validate_terms(self, terms: Tuple[int or RN, ...]) -> None: ...
-    @classmethod
-    def string_builder(cls) -> Callable: ...
+    _JOINT = ...  # type: str
     def rv(self) -> RN: ...
@@ -1,5 +1,6 @@
 import unittest
-from rnenv111.rn.rn import RN
+import numpy
+from rnenv111.rn.rn import RN, Operation, Add, Mul, MatMul
 
 
 class RNTestCase(unittest.TestCase):
@@ -9,6 +10,135 @@ class RNTestCase(unittest.TestCase):
         self.assertEqual(RN(63) - (RN(48) - (RN(14) + RN(2) * RN(16))) * (RN(2) * RN(12)) -
                          (RN(2) + RN(28) / RN(4)) - RN(18) / (RN(14) - RN(48) / RN(24) - RN(56) / RN(8) - RN(2)), 0)
 
+    def test_deep_int_cast(self):
+        # int and float casts should not hit the recursion limit on deeply nested RNs
+        rn = RN(1)
+        for _ in range(5000):
+            rn = RN(rn, RN(1), op=Add)
+        self.assertEqual(float(rn), 5001.0)
+        self.assertEqual(int(rn), 5001)
+        # the values of the terms are cached by the cast too
+        self.assertEqual(rn[0]._fcache, 5000.0)
+
+    def test_deep_sum_parsing(self):
+        # sum terms are collected without recursion
+        root = MatMul(2, 3).rv()
+        rn = RN(1)
+        for _ in range(3000):
+            rn = RN(rn, root, op=Add)
+        terms = Add._parse_sum(rn)
+        self.assertEqual(len(terms), 3001)
+        self.assertIs(terms[-1], root)
+
+    def test_root_float_cast(self):
+        # MatMul terms are (index, radicand)
+        self.assertAlmostEqual(float(MatMul(2, 3).rv()), 3 ** 0.5)
+        self.assertAlmostEqual(float(MatMul(3, 16).rv()), 16 ** (1 / 3))
+
+    def test_njit_callable(self):
+        # the function evaluates the tree of the RN for any values of its leaves
+        rn = RN(2) * MatMul(2, 3).rv() + MatMul(3, 5).rv()
+        function = rn.as_njit_callable()
+        self.assertEqual(rn.leaves(), (3, 5, 2, 2, 3))
+        self.assertAlmostEqual(function(numpy.array(rn.leaves(), dtype=float)), float(rn))
+        self.assertAlmostEqual(function(numpy.array([3., 8., 1., 2., 4.])), 4.)
+
+    def test_roots_product(self):
+        # roots are multiplied under the lcm of their indexes
+        self.assertEqual(str(MatMul(2, 3).rv() * MatMul(3, 2).rv()), '6 √ 108')
+        self.assertEqual(str(MatMul(4, 3).rv() * MatMul(6, 2).rv()), '12 √ 108')
+
+    def test_sum_with_rationals(self):
+        # merged sum terms are stored in a single Add, without adding them up again
+        _sum = MatMul(2, 3).rv() + MatMul(2, 2).rv()
+        self.assertEqual(str(_sum + RN(3)), '3 + 2 √ 2 + 2 √ 3')
+        self.assertAlmostEqual(float(RN(1) / RN(3) + _sum), 1 / 3 + 3 ** 0.5 + 2 ** 0.5)
+
+    def test_associative_flattening(self):
+        # nested products are stored as a single n-ary Mul, with integer factors merged
+        product = RN(3) * (RN(2) * MatMul(3, 2).rv())
+        self.assertIs(product.op, Mul)
+        self.assertEqual(len(product.terms), 2)
+        self.assertEqual(str(product), '6 * 3 √ 2')
+        # merged integers equal to the neutral element are dropped
+        root = MatMul(2, 3).rv()
+        self.assertIs(abs(-root), root)
+        self.assertIs(RN(0) + root, root)
+        # a product of more than two factors is not a coefficient times one of its roots
+        product = RN(2) * MatMul(2, 2).rv() * (RN(1) + MatMul(2, 3).rv())
+        self.assertAlmostEqual(float(product + MatMul(2, 2).rv()), float(product) + 2 ** 0.5)
+        # a root is merged with its integer multiples, whatever the position of the coefficient
+        self.assertEqual(-root + root, 0)
+        self.assertEqual(root + -root, 0)
+        self.assertEqual(str(RN(2) * root + root), '3 * 2 √ 3')
+
+    def test_slots(self):
+        # RNs and operations store no instance __dict__
+        self.assertFalse(hasattr(RN(1000), '__dict__'))
+        self.assertFalse(hasattr(MatMul(2, 3).rv(), '__dict__'))
+        self.assertFalse(hasattr(Add(RN(1), RN(2)), '__dict__'))
+        self.assertFalse(hasattr(MatMul(2, 3), '__dict__'))
+
+    def test_unique_rns(self):
+        # RNs with the same op and terms are the same object, and hash as their value if simple
+        self.assertIs(RN(1000), RN(1000))
+        self.assertIs(MatMul(2, 3).rv(), MatMul(2, 3).rv())
+        self.assertIs(RN(2) * MatMul(2, 3).rv(), RN(2) * MatMul(2, 3).rv())
+        self.assertEqual(hash(RN(1000)), hash(1000))
+        self.assertEqual(len({MatMul(2, 3).rv(), MatMul(2, 3).rv(), RN(2) * MatMul(2, 3).rv()}), 2)
+        # the terms of commutative operations are stored in a canonical order
+        root, other = MatMul(2, 2).rv(), MatMul(2, 3).rv()
+        self.assertIs(RN(2) * root, root * RN(2))
+        self.assertEqual(len({RN(2) * root, root * RN(2)}), 1)
+        self.assertIs(root * other, other * root)
+        self.assertEqual(hash(root + other), hash(other + root))
+
+    def test_integers_equality(self):
+        # simple RNs are compared exactly, not by their float values
+        self.assertNotEqual(RN(2 ** 60 + 1), RN(2 ** 60))
+        self.assertEqual(RN(2 ** 60 + 1), 2 ** 60 + 1)
+
+    def test_zero_division(self):
+        self.assertRaises(ZeroDivisionError, lambda: RN(1) / RN(0))
+        self.assertRaises(ZeroDivisionError, lambda: RN(1) // 0)
+        self.assertRaises(ZeroDivisionError, lambda: RN(1) / (RN(1) - RN(1)))
+
+    def test_rational_folding(self):
+        # operations between integers and integer fractions are folded into a single fraction
+        self.assertEqual(str(RN(3) + RN(1) / RN(3)), '10 / 3')
+        self.assertEqual(str(RN(1) / RN(3) - RN(-5) / RN(6)), '7 / 6')
+        self.assertEqual(str(RN(-5) / RN(6) // RN(1) / RN(3)), '-1 / 3')
+        self.assertEqual(str(RN(-5) / RN(6) % RN(3)), '13 / 6')
+        # large denominators are cross cancelled before multiplying
+        self.assertEqual(str(RN(3) / RN(2 ** 40 + 1) * (RN(2 ** 40 + 1) / RN(9))), '1 / 3')
+        # numerators above the float range are folded too
+        self.assertEqual(str(RN(10 ** 400) / RN(3) + RN(2) / RN(3)), str((10 ** 400 + 2) // 3))
+        self.assertEqual(str(RN(10 ** 400) / RN(3) * 2), str(2 * 10 ** 400) + ' / 3')
+
+    def test_integer_roots(self):
+        # integer roots are found exactly, without float rounding
+        self.assertEqual(MatMul(3, -27).rv(), -3)
+        self.assertEqual(MatMul(2, 10 ** 40).rv(), 10 ** 20)
+        self.assertIs(MatMul(2, 10 ** 12 + 1).rv().op, MatMul)
+        # odd roots of negative radicands keep their sign out of the root
+        self.assertAlmostEqual(float(MatMul(3, -2).rv()), -2 ** (1 / 3))
+        self.assertEqual(str(MatMul(3, -16).rv()), '-2 * 3 √ 2')
+
+    def test_floor_division(self):
+        # floor divisions of fractions are integers, exact for integer fractions
+        self.assertEqual(RN(10 ** 30 + 1) / RN(3) // RN(-2), (10 ** 30 + 1) // -6)
+        quotient = RN(-7) // (MatMul(2, 3).rv() / RN(5))
+        self.assertIsNone(quotient.op)
+        self.assertEqual(quotient, -21)
+
+    def test_other_operation_terms(self):
+        # terms of operations without operation methods are left in an RN of the operation
+        class Neg(Operation):
+            OPERANDS_NUMBER = 1
+        rn = RN(RN(3), op=Neg)
+        self.assertIs((rn + RN(1)).op, Add)
+        self.assertIs((RN(2) * rn).op, Mul)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,19 +2,22 @@
 Functional RNs representation test
 MODULE 2
 
-Will Implement a more restrictive interface (using @abc abstractmethod)
-for the class operations implementation
+Will Implement a more restrictive interface for the class operations implementation
+(documented, not enforced at runtime with abc, to keep operations construction cheap)
 
 Each operation must define a 'string' staticmethod (where *args is the iterable of the terms of the operation),
  an 'rv' method (which should return a RN object referencing the class as main operator and the instance operands)
  and an __init__ (where *args indicates the terms involved in the operation)
 """
 
-from abc import abstractmethod, ABCMeta, ABC
+import operator
+from functools import reduce
 from rnenv110.rn.mathfuncs.funcs import fraction_from_float
 
 
 EC = ['⁰', '¹', '²', '³', '⁴', '⁵', '⁶', '⁷', '⁸', '⁹']  # exponent chars
+_EC_TABLE = str.maketrans('0123456789', ''.join(EC))  # digits to exponent chars
+_ROOT_CACHE = {}  # index -> MetaRoot generated class
 
 
 class RN:
@@ -22,6 +25,8 @@ class RN:
     Real Number class
     """
 
+    __slots__ = ('op', 'terms')
+
     def __init__(self, *args, op=None):
         if not op:
             assert len(args) == 1
@@ -29,24 +34,65 @@ class RN:
         self.op = op
         self.terms = args
 
+    @classmethod
+    def _make(cls, op, terms):
+        """
+        Build RN without the __init__ check, used by the operations that already know their terms
+
+        :param op: operation class (None for simple RNs)
+        :param terms: tuple of terms
+        :return: RN object
+        """
+        rn = cls.__new__(cls)
+        rn.op = op
+        rn.terms = terms
+        return rn
+
     def __str__(self):
         if not self.op:
             return str(self.terms[0])
         return self.op.string(*self.terms)
 
+    def _int_operand(self, other):
+        """
+        Integer value of other if both self and other are simple RNs (or other is an int), else None
+
+        :param other: second operand
+        :return: int or None
+        """
+        if not self.op:
+            if other.__class__ is int:
+                return other
+            if other.__class__ is RN and not other.op:
+                return other.terms[0]
+        return None
+
     def __add__(self, other):
+        # integer fast path
+        value = self._int_operand(other)
+        if value is not None:
+            return RN(self.terms[0] + value)
         return Add(self, other).rv()
 
     def __sub__(self, other):
+        value = self._int_operand(other)
+        if value is not None:
+            return RN(self.terms[0] - value)
         return Sub(self, other).rv()
 
     def __mul__(self, other):
+        value = self._int_operand(other)
+        if value is not None:
+            return RN(self.terms[0] * value)
         return Mul(self, other).rv()
 
     def __truediv__(self, other):
         return TrueDiv(self, other).rv()
 
     def __floordiv__(self, other):
+        value = self._int_operand(other)
+        if value:
+            return RN(self.terms[0] // value)
         return FloorDiv(self, other).rv()
 
     def __pow__(self, power, modulo=None):
@@ -56,26 +102,35 @@ class RN:
         return other.__rmatmul__(self)
 
     def __rmatmul__(self, other):
-        return MetaRoot('root_' + str(other), (Operation, ), {}, index=other)(self).rv()
-
-
-class Operation(metaclass=ABCMeta):
+        # root classes are cached by the int value of the index (RNs hash by identity)
+        if other.__class__ is RN:
+            if other.op:
+                raise ValueError('Bad user operands, root index must be an integer, got {}'.format(other))
+            other = other.terms[0]
+        cls = _ROOT_CACHE.get(other)
+        if cls is None:
+            cls = _ROOT_CACHE[other] = MetaRoot('root_' + str(other), (Operation, ), {}, index=other)
+        return cls(self).rv()
+
+
+class Operation:
     OPERANDS_TYPES = (RN, int)
+    __slots__ = ('terms', )
 
     def __init__(self, *args):
         """
 
         :param args: instance operands
         """
-        if not any(isinstance(term, tp) for tp in self.OPERANDS_TYPES for term in args):
-            raise ValueError('Bad user operands, must be {} for {}, got a list {}'.format(
-                self.OPERANDS_TYPES, self.__class__, str(list(map(lambda a: type(a), args)))
-            ))
+        for term in args:
+            if not isinstance(term, self.OPERANDS_TYPES):
+                raise ValueError('Bad user operands, must be {} for {}, got a list {}'.format(
+                    self.OPERANDS_TYPES, self.__class__, str([type(a) for a in args])
+                ))
         # every item in terms is RN (not int)
-        self.terms = list(map(lambda x: x if isinstance(x, RN) else RN(x), args))
+        self.terms = [x if type(x) is RN else RN(x) for x in args]
 
     @staticmethod
-    @abstractmethod
     def string(*args) -> str:
         """
 
@@ -89,16 +144,35 @@ class Operation(metaclass=ABCMeta):
         :return: associated Real Number
         """
 
-        return RN(op=self.__class__.__name__, *self.terms)
+        return RN._make(self.__class__, tuple(self.terms))
 
 
 # operations example
-class ArithmeticOperator(Operation, ABC):
+class ArithmeticOperator(Operation):
     """
-    ABC class for arithmetic operators like Add, Sub, Mul, TrueDiv and FloorDiv
+    Base class for arithmetic operators like Add, Sub, Mul, TrueDiv and FloorDiv
     They share a similar string data handling
     """
 
+    __slots__ = ()
+
+    # associative operators (Add, Mul) splice the terms of nested operations of their class
+    ASSOCIATIVE = False
+
+    # operator function for every subclass, filled after the subclasses definitions
+    _OP_FUNC = {}
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        if self.ASSOCIATIVE:
+            terms = []
+            for term in self.terms:
+                if term.op is self.__class__:
+                    terms.extend(term.terms)
+                else:
+                    terms.append(term)
+            self.terms = terms
+
     @classmethod
     def string_builder(cls, op):
         """
@@ -107,45 +181,52 @@ class ArithmeticOperator(Operation, ABC):
         :param op: operator string
         :return: string representation
         """
+        joint = ' ' + op + ' '
+        # two terms (the most common case) are formatted by an f-string compiled for the joint
+        format_2 = eval("lambda a, b: f'{a}" + joint + "{b}'")
+
         def inner(*args):
+            if len(args) == 2:
+                return format_2(*args)
             if len(args) == 1:
                 return str(args[0])
-            joint = ' ' + op + ' '
-            return joint.join([str(term) for term in args])
+            return joint.join(map(str, args))
         return inner
 
+    def __init_subclass__(cls, op_str=None, **kwargs):
+        """
+        Build the string method of the subclass once, from its operator string
+
+        :param op_str: operator string, None for subclasses that define their own string method
+        """
+        super().__init_subclass__(**kwargs)
+        if op_str is not None:
+            cls._JOINT = ' ' + op_str + ' '
+            cls.string = staticmethod(cls.string_builder(op_str))
+
     def rv(self):
         # terms are RN
-        if not self.terms[0].op and not self.terms[1].op:
-            # build func name
-            code_fragment = 'self.terms[0].terms[0].' \
-                            + '__' + self.__class__.__name__.lower() + '__' + '(self.terms[1].terms[0])'
-            return RN(eval(code_fragment))
-        return RN(op=self.__class__.__name__, *self.terms)
+        if not any(term.op for term in self.terms):
+            return RN(reduce(self._OP_FUNC[self.__class__], [term.terms[0] for term in self.terms]))
+        return RN._make(self.__class__, tuple(self.terms))
 
 
-class Add(ArithmeticOperator):
-    @staticmethod
-    def string(*args) -> str:
-        return Add.string_builder('+')(*args)
+class Add(ArithmeticOperator, op_str='+'):
+    __slots__ = ()
+    ASSOCIATIVE = True
 
 
-class Sub(ArithmeticOperator):
-    @staticmethod
-    def string(*args) -> str:
-        return Sub.string_builder('-')(*args)
+class Sub(ArithmeticOperator, op_str='-'):
+    __slots__ = ()
 
 
-class Mul(ArithmeticOperator):
-    @staticmethod
-    def string(*args) -> str:
-        return Sub.string_builder('*')(*args)
+class Mul(ArithmeticOperator, op_str='*'):
+    __slots__ = ()
+    ASSOCIATIVE = True
 
 
-class TrueDiv(ArithmeticOperator):
-    @staticmethod
-    def string(*args) -> str:
-        return Sub.string_builder('/')(*args)
+class TrueDiv(ArithmeticOperator, op_str='/'):
+    __slots__ = ()
 
     def rv(self):
         """
@@ -164,20 +245,20 @@ class TrueDiv(ArithmeticOperator):
             if round(quotient, 5) == int(quotient):
                 return RN(int(quotient))
             else:
-                return RN(*fraction_from_float(quotient), op=self.__class__.__name__)
+                return RN._make(self.__class__, tuple(fraction_from_float(quotient)))
         return super().rv()
 
 
-class FloorDiv(ArithmeticOperator):
-    @staticmethod
-    def string(*args) -> str:
-        return Sub.string_builder('//')(*args)
+class FloorDiv(ArithmeticOperator, op_str='//'):
+    __slots__ = ()
 
 
 # root builder
-class MetaRoot(ABCMeta):
+class MetaRoot(type):
     def __new__(mcs, name, bases, namespace, **kwargs):
-        mcs.index = kwargs['index']
+        # store the index on the generated class, not on the metaclass, so cached classes keep their own
+        namespace['index'] = kwargs['index']
+        namespace['__slots__'] = ('radicand', )
         assert Operation in bases
         return super().__new__(mcs, name, bases, namespace)
 
@@ -185,9 +266,11 @@ class MetaRoot(ABCMeta):
         super().__init__(name, bases, namespace)
 
         def meta_string_builder(index):
+            # the index prefix is the same for every root of the class, build it once
+            prefix = str(index).translate(_EC_TABLE) + '√'
 
             def inner(radicand: RN or int):
-                return ''.join([EC[int(ch)] for ch in str(index)]) + '√' + str(radicand)
+                return prefix + str(radicand)
             return inner
 
         def _init(self, radicand: RN or int):
@@ -197,17 +280,22 @@ class MetaRoot(ABCMeta):
             if round(self.radicand.terms[0] ** (1 / self.__class__.index), 5) == int(
                     self.radicand.terms[0] ** (1 / self.__class__.index)):
                 return RN(*[int(self.radicand.terms[0] ** (1 / self.__class__.index))])
-            return RN(op=self.__class__, *[self.radicand])
+            return RN._make(self.__class__, (self.radicand, ))
 
         # add string method (build using meta_string_builder)
         setattr(cls, 'string', staticmethod(meta_string_builder(cls.index)))
-        # clear abstractmethods manually
-        setattr(cls, '__abstractmethods__', frozenset())
         cls.__init__ = _init
         cls.rv = rv
 
 
-class Pow(ArithmeticOperator):
-    @staticmethod
-    def string(*args) -> str:
-        return Pow.string_builder('**')(*args)
+class Pow(ArithmeticOperator, op_str='**'):
+    __slots__ = ()
+
+
+ArithmeticOperator._OP_FUNC.update({
+    Add: operator.add,
+    Sub: operator.sub,
+    Mul: operator.mul,
+    FloorDiv: operator.floordiv,
+    Pow: operator.pow,
+})